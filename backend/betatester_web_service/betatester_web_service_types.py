@@ -1,22 +1,39 @@
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 from uuid import UUID
 
 from betatester.betatester_types import (
     Action,
+    ActionElement,
+    ActionType,
     FileClient,
     ModelChat,
     ScrapeFiles,
     ScrapeSpec,
     ScrapeVariables,
 )
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
 from betatester import ScrapeAiExecutor, ScrapeSpecExecutor
 from betatester_web_service.utils import model_client, settings
 
 
+def _now_iso() -> str:
+    return datetime.now().isoformat()
+
+
+def _action_from_trusted(serialized: dict) -> Action:
+    # actions inside event_history were validated on write, construct the
+    # nested models directly instead of re-running their validators
+    return Action.model_construct(
+        element=ActionElement.model_construct(**serialized["element"]),
+        action_type=ActionType(serialized["action_type"]),
+        action_value=serialized.get("action_value"),
+    )
+
+
 class ConfigBase(BaseModel):
     url: str
     name: str
@@ -33,6 +50,22 @@ class ConfigBase(BaseModel):
 class TestConfig(ConfigBase):
     config_id: UUID
 
+    @cached_property
+    def _executor_kwargs(self) -> dict:
+        # the config never changes after hydration, so the executor kwargs
+        # are assembled once per instance instead of per run
+        return {
+            "url": self.url,
+            "high_level_goal": self.high_level_goal,
+            "max_page_views": self.max_page_views,
+            "max_total_actions": self.max_total_actions,
+            "max_action_attempts_per_step": self.max_action_attempts_per_step,
+            "viewport_width": self.viewport_width,
+            "viewport_height": self.viewport_height,
+            "variables": self.variables,
+            "files": self.files,
+        }
+
     def scrape_executor(
         self,
         scrape_id: UUID,
@@ -41,19 +74,11 @@ class TestConfig(ConfigBase):
     ) -> tuple[ScrapeAiExecutor, Optional[ScrapeSpecExecutor]]:
         scraper_ai = ScrapeAiExecutor(
             scrape_id=scrape_id,
-            url=self.url,
-            high_level_goal=self.high_level_goal,
-            max_page_views=self.max_page_views,
-            max_total_actions=self.max_total_actions,
-            max_action_attempts_per_step=self.max_action_attempts_per_step,
-            viewport_width=self.viewport_width,
-            viewport_height=self.viewport_height,
-            variables=self.variables,
-            files=self.files,
             openai_api_key=settings.openai_api_key,
             http_client=model_client,
             file_client=file_client,
             save_playwright_trace=True,
+            **self._executor_kwargs,
         )
         scraper_spec = None
         if scrape_spec is not None:
@@ -93,10 +118,8 @@ class RunStep(BaseModel):
     status: ScrapeStatus
     debug_next_step_chat: Optional[list[ModelChat]]
     debug_choose_action_chat: Optional[list[ModelChat]]
-    start_timestamp: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    start_timestamp: str = Field(default_factory=_now_iso)
+    timestamp: str = Field(default_factory=_now_iso)
 
     @staticmethod
     def _process_debug_chat(
@@ -109,11 +132,13 @@ class RunStep(BaseModel):
 
     @classmethod
     def from_serialized(cls, serialized: dict) -> "RunStep":
-        return cls(
-            step_id=serialized["step_id"],
+        # rows were validated when this service wrote them, so hydration
+        # skips the validator pipeline and only converts the typed fields
+        return cls.model_construct(
+            step_id=UUID(serialized["step_id"]),
             next_step=serialized["next_step"],
             action=(
-                Action(**serialized["action"])
+                _action_from_trusted(serialized["action"])
                 if serialized["action"] is not None
                 else None
             ),
@@ -136,10 +161,8 @@ class RunEventMetadata(BaseModel):
     url: str
     high_level_goal: str
     status: ScrapeStatus
-    start_timestamp: str = Field(
-        default_factory=lambda: datetime.now().isoformat()
-    )
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    start_timestamp: str = Field(default_factory=_now_iso)
+    timestamp: str = Field(default_factory=_now_iso)
     page_views: int = 0
     action_count: int = 0
     max_page_views: int
@@ -149,13 +172,38 @@ class RunEventMetadata(BaseModel):
     scrape_spec_failed: bool
 
     @computed_field
-    @property
+    @cached_property
     def trace_url(self) -> str:
+        # id never changes for an instance, build the url once instead of
+        # on every serialization
         return f"https://trace.playwright.dev/?trace={settings.base_url}/data/trace/{self.id}.zip"
 
+    def _to_update_values(self) -> dict:
+        # explicit column dict for the test_events UPDATE, cheaper than
+        # model_dump with an exclusion set
+        return {
+            "config_id": self.config_id,
+            "url": self.url,
+            "high_level_goal": self.high_level_goal,
+            "status": self.status.value,
+            "page_views": self.page_views,
+            "action_count": self.action_count,
+            "max_page_views": self.max_page_views,
+            "max_total_actions": self.max_total_actions,
+            "fail_reason": self.fail_reason,
+        }
+
 
 class RunMessage(RunEventMetadata):
     steps: list[RunStep]
+    _metadata_cache: Optional[RunEventMetadata] = PrivateAttr(default=None)
+    _step_index: dict[UUID, RunStep] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        self._step_index = {step.step_id: step for step in self.steps}
+
+    def get_step(self, step_id: UUID) -> Optional[RunStep]:
+        return self._step_index.get(step_id)
 
     def _upsert_step(
         self,
@@ -165,7 +213,18 @@ class RunMessage(RunEventMetadata):
         action_count: Optional[int] = None,
         debug_next_step_chat: Optional[list[ModelChat]] = None,
         debug_choose_action_chat: Optional[list[ModelChat]] = None,
+        timestamp: Optional[str] = None,
     ) -> RunStep:
+        if (
+            next_step is None
+            and action is None
+            and action_count is None
+            and debug_next_step_chat is None
+            and debug_choose_action_chat is None
+        ):
+            # nothing changed, keep the step's timestamp instead of
+            # bumping it for a no-op update
+            return step
         if next_step is not None:
             step.next_step = next_step
         if action is not None:
@@ -176,19 +235,21 @@ class RunMessage(RunEventMetadata):
             step.debug_next_step_chat = debug_next_step_chat
         if debug_choose_action_chat is not None:
             step.debug_choose_action_chat = debug_choose_action_chat
-        step.timestamp = datetime.now().isoformat()
+        step.timestamp = timestamp or _now_iso()
         return step
 
     def update_metadata(
         self,
         page_views: Optional[int] = None,
         action_count: Optional[int] = None,
+        timestamp: Optional[str] = None,
     ) -> None:
         if page_views is not None:
             self.page_views = page_views
         if action_count is not None:
             self.action_count = action_count
-        self.timestamp = datetime.now().isoformat()
+        self.timestamp = timestamp or _now_iso()
+        self._metadata_cache = None
 
     def add_step(
         self,
@@ -198,38 +259,37 @@ class RunMessage(RunEventMetadata):
         action_count: Optional[int] = None,
         debug_next_step_chat: Optional[list[ModelChat]] = None,
         debug_choose_action_chat: Optional[list[ModelChat]] = None,
+        timestamp: Optional[str] = None,
     ) -> None:
-        new_steps = []
-        step_found = False
-        for step in self.steps:
-            if step.step_id == step_id:
-                step_found = True
-                step = self._upsert_step(
-                    step,
-                    next_step,
-                    action,
-                    action_count,
-                    debug_next_step_chat,
-                    debug_choose_action_chat,
-                )
-            new_steps.append(step)
-
-        if not step_found:
-            new_steps.append(
-                self._upsert_step(
-                    RunStep(
-                        step_id=step_id,
-                        next_step="",
-                        action=None,
-                        action_count=None,
-                        status=ScrapeStatus.running,
-                        debug_choose_action_chat=None,
-                        debug_next_step_chat=None,
-                    ),
-                    next_step,
-                )
+        step = self._step_index.get(step_id)
+        if step is not None:
+            self._upsert_step(
+                step,
+                next_step,
+                action,
+                action_count,
+                debug_next_step_chat,
+                debug_choose_action_chat,
+                timestamp,
             )
-        self.steps = new_steps
+        else:
+            # construct with the shared timestamp directly so the default
+            # factories and a second _upsert_step write are skipped; the
+            # arguments are internal and already typed, so skip validation
+            step_timestamp = timestamp or _now_iso()
+            step = RunStep.model_construct(
+                step_id=step_id,
+                next_step=next_step or "",
+                action=None,
+                action_count=None,
+                status=ScrapeStatus.running,
+                debug_choose_action_chat=None,
+                debug_next_step_chat=None,
+                start_timestamp=step_timestamp,
+                timestamp=step_timestamp,
+            )
+            self.steps.append(step)
+            self._step_index[step_id] = step
 
     def _step_status_update(self):
         if (
@@ -241,7 +301,8 @@ class RunMessage(RunEventMetadata):
 
     def _cleanup(self, status: ScrapeStatus) -> None:
         self.status = status
-        self.timestamp = datetime.now().isoformat()
+        self.timestamp = _now_iso()
+        self._metadata_cache = None
         self._step_status_update()
 
     def stop(self) -> None:
@@ -260,11 +321,24 @@ class RunMessage(RunEventMetadata):
             and self.steps[-1].status == ScrapeStatus.running
         ):
             self.steps[-1].status = ScrapeStatus.failed
-            self.steps[-1].timestamp = datetime.now().isoformat()
+            self.steps[-1].timestamp = _now_iso()
+
+    def _to_update_values(self) -> dict:
+        values = super()._to_update_values()
+        # mode="json" produces the builtins the JSONB adapter wants directly,
+        # without serializing to a string and parsing it back
+        values["event_history"] = self.model_dump(
+            mode="json", include={"steps"}
+        )["steps"]
+        return values
 
     @property
     def metadata(self) -> RunEventMetadata:
-        return RunEventMetadata(
+        if self._metadata_cache is not None:
+            return self._metadata_cache
+        # the fields are copied from an already-validated instance, so
+        # model_construct skips a redundant validator pass
+        self._metadata_cache = RunEventMetadata.model_construct(
             id=self.id,
             config_id=self.config_id,
             url=self.url,
@@ -276,9 +350,16 @@ class RunMessage(RunEventMetadata):
             action_count=self.action_count,
             max_page_views=self.max_page_views,
             max_total_actions=self.max_total_actions,
+            fail_reason=self.fail_reason,
             using_scrape_spec=self.using_scrape_spec,
             scrape_spec_failed=self.scrape_spec_failed,
         )
+        return self._metadata_cache
+
+
+class RunMessageDelta(BaseModel):
+    metadata: RunEventMetadata
+    changed_step: Optional[RunStep] = None
 
 
 class TestConfigResponse(BaseModel):
@@ -1,9 +1,9 @@
-import json
 import logging
-from typing import Optional, cast
+from typing import Optional
 from uuid import UUID
 
 from betatester.betatester_types import ScrapeSpec
+from cachetools import TTLCache
 from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import async_scoped_session
 
@@ -18,33 +18,58 @@ from betatester_web_service.db.models import ConfigModel, TestEventsModel
 
 logger = logging.getLogger(__name__)
 
+# configs only change through the upsert endpoint, which invalidates
+# explicitly; the ttl bounds staleness if a row is edited out of band
+_config_cache: TTLCache[UUID, TestConfig] = TTLCache(maxsize=1024, ttl=60)
+
+
+def invalidate_test_config_cache(config_id: UUID) -> None:
+    _config_cache.pop(config_id, None)
+
 
 async def get_test_config(
     config_id: UUID, db: async_scoped_session
 ) -> Optional[TestConfig]:
+    config = _config_cache.get(config_id)
+    if config is not None:
+        return config
+
     config_result = await db.execute(
-        select(ConfigModel).where(ConfigModel.id == config_id)
+        select(
+            ConfigModel.id,
+            ConfigModel.name,
+            ConfigModel.url,
+            ConfigModel.high_level_goal,
+            ConfigModel.max_page_views,
+            ConfigModel.max_total_actions,
+            ConfigModel.max_action_attempts_per_step,
+            ConfigModel.viewport_width,
+            ConfigModel.viewport_height,
+            ConfigModel.variables,
+            ConfigModel.files,
+        ).where(ConfigModel.id == config_id)
     )
-    config_model: ConfigModel = config_result.scalars().one_or_none()
+    config_model = config_result.one_or_none()
 
     if config_model is None:
         config = None
     else:
         config = TestConfig(
-            config_id=cast(UUID, config_model.id),
-            name=cast(str, config_model.name),
-            url=cast(str, config_model.url),
-            high_level_goal=cast(str, config_model.high_level_goal),
-            max_page_views=cast(int, config_model.max_page_views),
-            max_total_actions=cast(int, config_model.max_total_actions),
-            max_action_attempts_per_step=cast(
-                int, config_model.max_action_attempts_per_step
+            config_id=config_model.id,
+            name=config_model.name,
+            url=config_model.url,
+            high_level_goal=config_model.high_level_goal,
+            max_page_views=config_model.max_page_views,
+            max_total_actions=config_model.max_total_actions,
+            max_action_attempts_per_step=(
+                config_model.max_action_attempts_per_step
             ),
-            viewport_width=cast(int, config_model.viewport_width),
-            viewport_height=cast(int, config_model.viewport_height),
-            variables=cast(dict, config_model.variables),
-            files=cast(dict, config_model.files),
+            viewport_width=config_model.viewport_width,
+            viewport_height=config_model.viewport_height,
+            variables=config_model.variables,
+            files=config_model.files,
         )
+        _config_cache[config_id] = config
 
     return config
 
@@ -78,25 +103,13 @@ async def update_test_event(
     scrape_spec: Optional[ScrapeSpec] = None,
     scrape_spec_id: Optional[UUID] = None,
 ) -> None:
-    update_values = event.model_dump(
-        exclude={
-            "steps",
-            "id",
-            "timestamp",
-            "start_timestamp",
-            "trace_url",
-            "using_scrape_spec",
-            "scrape_spec_failed",
-        }
-    )
+    # each event class knows its own update columns, RunMessage adds
+    # event_history on top of the metadata values
+    update_values = event._to_update_values()
     update_values["scrape_spec"] = (
         None if scrape_spec is None else scrape_spec.model_dump()
     )
     update_values["scrape_spec_id"] = scrape_spec_id
-    if isinstance(event, RunMessage):
-        event_history_raw = event.model_dump_json(include={"steps"})
-        event_history = json.loads(event_history_raw)
-        update_values["event_history"] = event_history["steps"]
 
     await db.execute(
         update(TestEventsModel)
@@ -109,7 +122,10 @@ async def get_test_event_history(
     config_id: UUID,
     db: async_scoped_session,
 ) -> list[RunEventMetadata]:
-    event_result = await db.execute(
+    # stream() fetches rows through a server-side cursor, so long-lived
+    # configs with thousands of events never buffer the full raw result
+    # before models are built
+    event_result = await db.stream(
         select(
             TestEventsModel.id,
             TestEventsModel.config_id,
@@ -130,22 +146,24 @@ async def get_test_event_history(
         .order_by(TestEventsModel.updated_at.desc())
     )
 
+    # rows are trusted (written by this service), model_construct skips the
+    # validator pipeline for every event in the list
     event_metadata = []
-    for event in event_result:
+    async for event in event_result:
         event_metadata.append(
-            RunEventMetadata(
-                id=cast(UUID, event.id),
-                config_id=cast(UUID, event.config_id),
-                url=cast(str, event.url),
-                high_level_goal=cast(str, event.high_level_goal),
-                status=cast(ScrapeStatus, event.status),
-                max_page_views=cast(int, event.max_page_views),
-                max_total_actions=cast(int, event.max_total_actions),
-                start_timestamp=cast(str, event.created_at.isoformat()),
-                timestamp=cast(str, event.updated_at.isoformat()),
-                page_views=cast(int, event.page_views),
-                action_count=cast(int, event.action_count),
-                fail_reason=cast(str, event.fail_reason),
+            RunEventMetadata.model_construct(
+                id=event.id,
+                config_id=event.config_id,
+                url=event.url,
+                high_level_goal=event.high_level_goal,
+                status=ScrapeStatus(event.status),
+                max_page_views=event.max_page_views,
+                max_total_actions=event.max_total_actions,
+                start_timestamp=event.created_at.isoformat(),
+                timestamp=event.updated_at.isoformat(),
+                page_views=event.page_views,
+                action_count=event.action_count,
+                fail_reason=event.fail_reason,
                 using_scrape_spec=event.scrape_spec_id is not None,
                 scrape_spec_failed=event.scrape_spec is not None
                 and event.scrape_spec_id is None,
@@ -155,6 +173,56 @@ async def get_test_event_history(
     return event_metadata
 
 
+async def get_test_event_metadata(
+    config_id: UUID,
+    scrape_id: UUID,
+    db: async_scoped_session,
+) -> Optional[RunEventMetadata]:
+    # metadata-only callers skip fetching the potentially large
+    # event_history / scrape_spec JSONB blobs
+    event_result = await db.execute(
+        select(
+            TestEventsModel.id,
+            TestEventsModel.config_id,
+            TestEventsModel.url,
+            TestEventsModel.high_level_goal,
+            TestEventsModel.status,
+            TestEventsModel.max_page_views,
+            TestEventsModel.max_total_actions,
+            TestEventsModel.created_at,
+            TestEventsModel.updated_at,
+            TestEventsModel.page_views,
+            TestEventsModel.action_count,
+            TestEventsModel.fail_reason,
+            TestEventsModel.scrape_spec.isnot(None).label("has_scrape_spec"),
+            TestEventsModel.scrape_spec_id,
+        ).where(
+            TestEventsModel.config_id == config_id,
+            TestEventsModel.id == scrape_id,
+        )
+    )
+    event = event_result.one_or_none()
+    if event is None:
+        return None
+    return RunEventMetadata.model_construct(
+        id=event.id,
+        config_id=event.config_id,
+        url=event.url,
+        high_level_goal=event.high_level_goal,
+        status=ScrapeStatus(event.status),
+        max_page_views=event.max_page_views,
+        max_total_actions=event.max_total_actions,
+        start_timestamp=event.created_at.isoformat(),
+        timestamp=event.updated_at.isoformat(),
+        page_views=event.page_views,
+        action_count=event.action_count,
+        fail_reason=event.fail_reason,
+        using_scrape_spec=event.scrape_spec_id is not None,
+        scrape_spec_failed=event.has_scrape_spec
+        and event.scrape_spec_id is None,
+    )
+
+
 async def get_test_event(
     config_id: UUID,
     scrape_id: UUID,
@@ -169,23 +237,23 @@ async def get_test_event(
     event = event_result.scalars().one_or_none()
     run_messsage = None
     if event is not None:
-        run_messsage = RunMessage(
-            id=cast(UUID, event.id),
-            config_id=cast(UUID, event.config_id),
-            url=cast(str, event.url),
-            high_level_goal=cast(str, event.high_level_goal),
-            page_views=cast(int, event.page_views),
-            action_count=cast(int, event.action_count),
-            status=cast(ScrapeStatus, event.status),
+        run_messsage = RunMessage.model_construct(
+            id=event.id,
+            config_id=event.config_id,
+            url=event.url,
+            high_level_goal=event.high_level_goal,
+            page_views=event.page_views,
+            action_count=event.action_count,
+            status=ScrapeStatus(event.status),
             steps=[
                 RunStep.from_serialized(step)
-                for step in cast(list[dict], event.event_history)
+                for step in event.event_history
             ],
-            start_timestamp=cast(str, event.created_at.isoformat()),
-            timestamp=cast(str, event.updated_at.isoformat()),
-            max_page_views=cast(int, event.max_page_views),
-            max_total_actions=cast(int, event.max_total_actions),
-            fail_reason=cast(str, event.fail_reason),
+            start_timestamp=event.created_at.isoformat(),
+            timestamp=event.updated_at.isoformat(),
+            max_page_views=event.max_page_views,
+            max_total_actions=event.max_total_actions,
+            fail_reason=event.fail_reason,
             using_scrape_spec=event.scrape_spec_id is not None,
             scrape_spec_failed=event.scrape_spec is not None
             and event.scrape_spec_id is None,
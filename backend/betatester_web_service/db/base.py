@@ -3,6 +3,7 @@ from asyncio import current_task, shield
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator
 
+import orjson
 from sqlalchemy import MetaData, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -28,12 +29,23 @@ meta = MetaData(
 
 Base = declarative_base(metadata=meta)
 
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
 engine_to_bind = create_async_engine(
     settings.postgres_connection_string,
     pool_pre_ping=True,
     echo=False,
-    pool_size=10,
+    # sized for bursts of concurrent scrape starts plus status polling;
+    # pool_timeout fails fast instead of queueing for the default 30s
+    pool_size=20,
     max_overflow=20,
+    pool_timeout=10,
+    # orjson is much faster than the stdlib for the large event_history /
+    # scrape_spec JSONB payloads
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 SessionLocal = async_scoped_session(
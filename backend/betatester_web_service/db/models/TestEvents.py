@@ -1,4 +1,4 @@
-from sqlalchemy import VARCHAR, Column, ForeignKey, Integer, text
+from sqlalchemy import VARCHAR, Column, ForeignKey, Index, Integer, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -8,6 +8,14 @@ from betatester_web_service.db.mixins import ScrapeParamsMixin, TimestampMixin
 
 class TestEventsModel(Base, TimestampMixin, ScrapeParamsMixin):
     __tablename__ = "test_events"
+    __table_args__ = (
+        # serves the per-config history listing without a full table scan
+        Index(
+            "test_events_config_id_updated_at_idx",
+            "config_id",
+            "updated_at",
+        ),
+    )
 
     id = Column(
         UUID(as_uuid=True),
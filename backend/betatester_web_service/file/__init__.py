@@ -1,13 +1,18 @@
-import json
+from functools import lru_cache
 
-from betatester.betatester_types import FileClientType
+from betatester.betatester_types import FileClient, FileClientType
 
 from betatester_web_service.utils import settings
 
-if settings.file_client_type == FileClientType.local:
-    from betatester.file.local import LocalFileClient
 
-    save_path = json.loads(settings.file_client_config)["save_path"]
-    file_client = LocalFileClient(save_path)
-else:
-    raise ValueError(f"Invalid file provider: {settings.file_client_type}")
+@lru_cache(maxsize=1)
+def get_file_client() -> FileClient:
+    # constructed lazily so importing this package has no side effects
+    if settings.file_client_type == FileClientType.local:
+        from betatester.file.local import LocalFileClient
+
+        return LocalFileClient(settings.file_client_config.save_path)
+    else:
+        raise ValueError(
+            f"Invalid file provider: {settings.file_client_type}"
+        )
@@ -0,0 +1,34 @@
+import asyncio
+from collections import deque
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleConsumerQueue(Generic[T]):
+    """
+    Drop-in replacement for asyncio.Queue for the single-producer /
+    single-consumer SSE channel. A plain deque plus a wakeup future avoids
+    asyncio.Queue's internal getter/putter bookkeeping on every message.
+    """
+
+    def __init__(self) -> None:
+        self._items: deque[T] = deque()
+        self._waiter: Optional[asyncio.Future[None]] = None
+
+    def put_nowait(self, item: T) -> None:
+        self._items.append(item)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self) -> T:
+        while not self._items:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._items.popleft()
+
+    def empty(self) -> bool:
+        return not self._items
@@ -1,10 +1,9 @@
 import logging
-from typing import cast
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import Column, insert, select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import async_scoped_session
 
 from betatester_web_service.betatester_web_service_types import (
@@ -15,6 +14,7 @@ from betatester_web_service.betatester_web_service_types import (
 from betatester_web_service.db.api import (
     get_test_config,
     get_test_event_history,
+    invalidate_test_config_cache,
 )
 from betatester_web_service.db.base import get_session
 from betatester_web_service.db.models import ConfigModel
@@ -48,35 +48,26 @@ async def upsert_config(
             ],
         )
         config = config_raw.scalars().one()
-        config_id = cast(UUID, config.id)
+        config_id = config.id
 
     else:
         config_id = request.config_id
-        config_result = await db.execute(
-            select(ConfigModel).where(ConfigModel.id == config_id)
+        # one UPDATE instead of loading the row and dirtying every
+        # attribute through the ORM's change tracking
+        update_result = await db.execute(
+            update(ConfigModel)
+            .where(ConfigModel.id == config_id)
+            .values(**request.model_dump(exclude={"config_id"}))
+            .returning(ConfigModel.id)
         )
-        config: ConfigModel = config_result.scalars().one_or_none()
-        if config is None:
+        if update_result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=404,
                 detail="Config not found",
             )
-        config.name = cast(Column[str], request.name)
-        config.url = cast(Column[str], request.url)
-        config.high_level_goal = cast(Column[str], request.high_level_goal)
-        config.max_page_views = cast(Column[int], request.max_page_views)
-        config.max_total_actions = cast(Column[int], request.max_total_actions)
-        config.max_action_attempts_per_step = cast(
-            Column[int], request.max_action_attempts_per_step
-        )
-        config.viewport_width = cast(Column[int], request.viewport_width)
-        config.viewport_height = cast(Column[int], request.viewport_height)
-        config.variables = cast(Column[dict], request.variables)
-        config.files = cast(
-            Column[dict], {k: v.model_dump() for k, v in request.files.items()}
-        )
 
     await db.commit()
+    invalidate_test_config_cache(config_id)
     return UpsertConfigResponse(config_id=config_id)
 
 
@@ -84,18 +75,24 @@ async def upsert_config(
 async def get_all_configs(
     db: async_scoped_session = Depends(get_session),
 ) -> list[TestConfigMetadata]:
+    # project only the listed columns, the variables / files JSON blobs
+    # would be fetched and thrown away otherwise
     configs_result = await db.execute(
-        select(ConfigModel).order_by(ConfigModel.updated_at.desc())
+        select(
+            ConfigModel.id,
+            ConfigModel.name,
+            ConfigModel.url,
+            ConfigModel.updated_at,
+        ).order_by(ConfigModel.updated_at.desc())
     )
-    configs = configs_result.scalars().all()
     return [
         TestConfigMetadata(
-            config_id=cast(UUID, config.id),
-            name=cast(str, config.name),
+            config_id=config.id,
+            name=config.name,
             last_updated=config.updated_at.isoformat(),
-            url=cast(str, config.url),
+            url=config.url,
         )
-        for config in configs
+        for config in configs_result
     ]
 
 
@@ -1,10 +1,11 @@
 import logging
+import os
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import FileResponse
 
-from betatester_web_service.file import file_client
+from betatester_web_service.file import get_file_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +17,54 @@ router = APIRouter(
 )
 
 
+def _cached_file_response(
+    path: str,
+    etag: str,
+    cache_control: str,
+    media_type: str,
+    request: Request,
+) -> Response:
+    # stat once here and hand the result to FileResponse, which would
+    # otherwise stat the path again itself; a missing file becomes a 404
+    # instead of an error mid-response
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+    etag = etag or f'"{stat_result.st_mtime_ns}-{stat_result.st_size}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path=path,
+        headers=headers,
+        media_type=media_type,
+        stat_result=stat_result,
+    )
+
+
 @router.get("/screenshot/{scrape_id}/{step_id}.png")
-async def get_screenshot(scrape_id: UUID, step_id: UUID):
-    return FileResponse(path=file_client.img_path(scrape_id, step_id))
+async def get_screenshot(scrape_id: UUID, step_id: UUID, request: Request):
+    # a step's screenshot can be rewritten while the step retries, so the
+    # etag comes from the file stat and clients revalidate instead of
+    # caching it unconditionally
+    return _cached_file_response(
+        get_file_client().img_path(scrape_id, step_id),
+        "",
+        "public, max-age=60",
+        "image/png",
+        request,
+    )
 
 
 @router.get("/trace/{scrape_id}.zip")
-async def get_trace(scrape_id: UUID):
-    return FileResponse(path=file_client.trace_path(scrape_id))
+async def get_trace(scrape_id: UUID, request: Request):
+    # the trace zip is written once when the scrape finishes and never
+    # changes afterwards, so browsers can cache it indefinitely
+    return _cached_file_response(
+        get_file_client().trace_path(scrape_id),
+        f'"{scrape_id}"',
+        "public, max-age=31536000, immutable",
+        "application/zip",
+        request,
+    )
@@ -1,7 +1,6 @@
 import asyncio
-import json
 import logging
-from typing import AsyncGenerator, Optional, Union
+from typing import AsyncGenerator, Final, Optional, Union
 from uuid import UUID
 
 from betatester.betatester_types import (
@@ -15,7 +14,8 @@ from betatester.model import openai_stream_response_generator
 from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, validator
+import orjson
+from pydantic import BaseModel, field_validator
 from sqlalchemy.ext.asyncio import async_scoped_session
 from sse_starlette.sse import EventSourceResponse
 
@@ -23,26 +23,43 @@ from betatester import ScrapeAiExecutor, ScrapeSpecExecutor
 from betatester_web_service.betatester_web_service_types import (
     RunEventMetadata,
     RunMessage,
+    RunMessageDelta,
     ScrapeStatus,
     StartScraperRequest,
+    _now_iso,
 )
 from betatester_web_service.db.api import (
     get_latest_scrape_spec,
     get_test_config,
     get_test_event,
+    get_test_event_metadata,
     insert_test_event,
     update_test_event,
 )
 from betatester_web_service.db.base import async_session_scope, get_session
-from betatester_web_service.file import file_client
+from betatester_web_service.file import get_file_client
+from betatester_web_service.message_queue import SingleConsumerQueue
 from betatester_web_service.task_manager import task_manager
 from betatester_web_service.utils import model_client, settings
 
 logger = logging.getLogger(__name__)
 
-message_queues: dict[str, asyncio.Queue[ExecutorMessage]] = {}
+# shared wake-up message, ExecutorMessage is frozen so reuse is safe
+_WAKE_MESSAGE: Final = ExecutorMessage()
+
+message_queues: dict[str, SingleConsumerQueue[ExecutorMessage]] = {}
+queue_ready: dict[str, asyncio.Event] = {}
 scraper_info_cache: TTLCache[str, RunMessage] = TTLCache(maxsize=100, ttl=3600)
-scraper_info_cache_lock = asyncio.Lock()
+scraper_info_locks: dict[str, asyncio.Lock] = {}
+# start requests in flight per config, so concurrent starts for the same
+# config share one scrape instead of racing to create two
+_inflight_starts: dict[UUID, "asyncio.Future[dict]"] = {}
+
+
+def _info_lock(item_key: str) -> asyncio.Lock:
+    # one lock per run instead of a global mutex, so concurrent scrapes
+    # never serialize each other's cache updates
+    return scraper_info_locks.setdefault(item_key, asyncio.Lock())
 
 
 router = APIRouter(
@@ -52,6 +69,22 @@ router = APIRouter(
 )
 
 
+def _schedule_queue_cleanup(item_key: str, delay: float = 60.0) -> None:
+    # finished runs would otherwise leave their queue objects (and any
+    # undrained messages) alive forever, give the SSE consumer a grace
+    # period to read the final message and then release them
+    loop = asyncio.get_running_loop()
+    loop.call_later(delay, message_queues.pop, item_key, None)
+    loop.call_later(delay, queue_ready.pop, item_key, None)
+    loop.call_later(delay, scraper_info_locks.pop, item_key, None)
+
+
+def _dump_sse(message: Union[RunMessage, RunMessageDelta]) -> str:
+    # orjson is significantly faster than pydantic's json encoder for the
+    # deeply nested step / debug chat payloads sent on every SSE tick
+    return orjson.dumps(message.model_dump(), default=str).decode()
+
+
 async def _scraper_setup(
     scraper: Union[ScrapeAiExecutor, ScrapeSpecExecutor],
     config_id: UUID,
@@ -59,7 +92,7 @@ async def _scraper_setup(
     scrape_spec_failed: bool,
 ) -> bool:
     using_scrape_spec = isinstance(scraper, ScrapeSpecExecutor)
-    async with scraper_info_cache_lock:
+    async with _info_lock(item_key):
         scraper_info_cache[item_key] = RunMessage(
             id=scraper.scrape_id,
             url=scraper.url,
@@ -78,7 +111,8 @@ async def _scraper_setup(
         )
 
     if scraper.scrape_id not in message_queues:
-        message_queues[item_key] = asyncio.Queue()
+        message_queues[item_key] = SingleConsumerQueue()
+    queue_ready.setdefault(item_key, asyncio.Event()).set()
 
     # subscribe to scraper
     if not using_scrape_spec:
@@ -96,37 +130,42 @@ async def _run_scraper(
     item_key = f"{config_id}-{scraper.scrape_id}"
     scrape_spec = None
     scrape_spec_failed = False
-    while True:
-        using_scrape_spec = await _scraper_setup(
-            scraper, config_id, item_key, scrape_spec_failed
-        )
-        try:
-            scrape_spec = await scraper.run()
-            scraper_info_cache[item_key].complete()
-        except Exception as e:
-            if using_scrape_spec:
-                logger.warning(
-                    "Falling back to Ai Scraper, scrape id %s error %s",
-                    scraper.scrape_id,
-                    str(e),
-                )
-                scraper = scraper_ai
-                scrape_spec_failed = True
-                continue
-            else:
-                scraper_info_cache[item_key].fail(str(e))
-        message_queues[item_key].put_nowait(ExecutorMessage())
-        break
-
-    async with async_session_scope() as db:
-        await update_test_event(
-            scraper_info_cache[item_key],
-            db,
-            scrape_spec,
-            None if scraper_spec is None else scraper_spec.original_scrape_id,
-        )
+    try:
+        while True:
+            using_scrape_spec = await _scraper_setup(
+                scraper, config_id, item_key, scrape_spec_failed
+            )
+            try:
+                scrape_spec = await scraper.run()
+                scraper_info_cache[item_key].complete()
+            except Exception as e:
+                if using_scrape_spec:
+                    logger.warning(
+                        "Falling back to Ai Scraper, scrape id %s error %s",
+                        scraper.scrape_id,
+                        str(e),
+                    )
+                    scraper = scraper_ai
+                    scrape_spec_failed = True
+                    continue
+                else:
+                    scraper_info_cache[item_key].fail(str(e))
+            message_queues[item_key].put_nowait(_WAKE_MESSAGE)
+            break
+
+        async with async_session_scope() as db:
+            await update_test_event(
+                scraper_info_cache[item_key],
+                db,
+                scrape_spec,
+                None
+                if scraper_spec is None
+                else scraper_spec.original_scrape_id,
+            )
 
-        await db.commit()
+            await db.commit()
+    finally:
+        _schedule_queue_cleanup(item_key)
 
 
 @router.post("/start")
@@ -134,6 +173,36 @@ async def run_scraper(
     request: StartScraperRequest,
     db: async_scoped_session = Depends(get_session),
 ):
+    inflight = _inflight_starts.get(request.config_id)
+    if inflight is not None:
+        return await inflight
+
+    start_future: "asyncio.Future[dict]" = (
+        asyncio.get_running_loop().create_future()
+    )
+    _inflight_starts[request.config_id] = start_future
+    try:
+        result = await _start_scraper(request, db)
+    except Exception as e:
+        start_future.set_exception(e)
+        # mark retrieved in case no other request is waiting on it
+        start_future.exception()
+        raise
+    else:
+        start_future.set_result(result)
+        return result
+    finally:
+        # if this request was cancelled mid-start the future was never
+        # resolved, cancel it so parked duplicate requests are released
+        if not start_future.done():
+            start_future.cancel()
+        _inflight_starts.pop(request.config_id, None)
+
+
+async def _start_scraper(
+    request: StartScraperRequest,
+    db: async_scoped_session,
+) -> dict:
     config = await get_test_config(request.config_id, db)
     if config is None:
         raise HTTPException(status_code=404, detail="Config not found")
@@ -147,7 +216,7 @@ async def run_scraper(
     )
 
     scraper_ai, scraper_scrape = config.scrape_executor(
-        test_event_id, file_client, scrape_spec
+        test_event_id, get_file_client(), scrape_spec
     )
 
     task_manager.add_task(
@@ -165,10 +234,14 @@ async def run_scraper(
 async def processing_stop(config_id: UUID, scrape_id: UUID):
     item_key = f"{config_id}-{scrape_id}"
     task_manager.cancel_task(item_key)
-    async with scraper_info_cache_lock:
+    async with _info_lock(item_key):
         if item_key in scraper_info_cache:
             scraper_info_cache[item_key].stop()
-            message_queues[item_key].put_nowait(ExecutorMessage())
+            # the queue is cleaned up a minute after the run finishes while
+            # the info cache lives longer, so it may already be gone
+            queue = message_queues.get(item_key)
+            if queue is not None:
+                queue.put_nowait(_WAKE_MESSAGE)
 
     async with async_session_scope() as db:
         test_event = await get_test_event(config_id, scrape_id, db)
@@ -186,17 +259,20 @@ async def processing_status(
     db: async_scoped_session = Depends(get_session),
 ) -> RunEventMetadata:
     item_key = f"{config_id}-{scrape_id}"
-    async with scraper_info_cache_lock:
-        scraper_info = scraper_info_cache.get(item_key)
-        if scraper_info is None or scraper_info.id != scrape_id:
-            scraper_info = await get_test_event(config_id, scrape_id, db)
-
-    if scraper_info is None:
+    # a plain cache read is a single dict op, atomic under asyncio, so no
+    # lock is needed here
+    scraper_info = scraper_info_cache.get(item_key)
+    if scraper_info is not None and scraper_info.id == scrape_id:
+        return scraper_info.metadata
+
+    # this endpoint only needs metadata, skip loading the step history
+    metadata = await get_test_event_metadata(config_id, scrape_id, db)
+    if metadata is None:
         raise HTTPException(
             status_code=404,
             detail="Scrape not found",
         )
-    return scraper_info.metadata
+    return metadata
 
 
 @router.get("/status-ui/{config_id}/{scrape_id}", include_in_schema=False)
@@ -207,37 +283,100 @@ async def run_status_ui(
 ):
     async def event_generator():
         item_key = f"{config_id}-{scrape_id}"
-        async with scraper_info_cache_lock:
+        async with _info_lock(item_key):
             scrape_info = scraper_info_cache.get(item_key)
             if scrape_info is None:
                 scrape_info = await get_test_event(config_id, scrape_id, db)
                 if scrape_info is not None:
                     # add to cache
                     scraper_info_cache[item_key] = scrape_info
-        if item_key in scraper_info_cache:
-            yield {"data": scraper_info_cache[item_key].model_dump_json()}
+        last_data = None
+        sent_full_message = False
+        if scrape_info is not None:
+            last_data = _dump_sse(scrape_info)
+            sent_full_message = True
+            yield {"data": last_data}
+            if scrape_info.status != ScrapeStatus.running:
+                # the run already finished, close instead of holding the
+                # connection open waiting for messages that never come
+                return
         while True:
             if item_key in message_queues:
-                message = await message_queues[item_key].get()
-                async with scraper_info_cache_lock:
-                    content = message
-                    scraper_info_cache[item_key].update_metadata(
-                        action_count=content.scrape_action_count,
-                        page_views=content.scrape_page_view_count,
-                    )
-                    if content.step_id is not None:
-                        scraper_info_cache[item_key].add_step(
-                            step_id=content.step_id,
-                            next_step=content.next_step,
-                            action=content.action,
-                            action_count=content.step_action_count,
-                            debug_choose_action_chat=content.choose_action_chat,
-                            debug_next_step_chat=content.next_step_chat,
+                queue = message_queues[item_key]
+                message = await queue.get()
+                async with _info_lock(item_key):
+                    # drain whatever else is already queued so a scraper
+                    # that outpaces the client costs one serialize + yield
+                    # per batch instead of per message
+                    timestamp = _now_iso()
+                    scrape_info = scraper_info_cache[item_key]
+                    changed_step_ids: list[UUID] = []
+                    while True:
+                        scrape_info.update_metadata(
+                            action_count=message.scrape_action_count,
+                            page_views=message.scrape_page_view_count,
+                            timestamp=timestamp,
                         )
-
-                yield {"data": scraper_info_cache[item_key].model_dump_json()}
+                        if message.step_id is not None:
+                            scrape_info.add_step(
+                                step_id=message.step_id,
+                                next_step=message.next_step,
+                                action=message.action,
+                                action_count=message.step_action_count,
+                                debug_choose_action_chat=(
+                                    message.choose_action_chat
+                                ),
+                                debug_next_step_chat=message.next_step_chat,
+                                timestamp=timestamp,
+                            )
+                            if message.step_id not in changed_step_ids:
+                                changed_step_ids.append(message.step_id)
+                        if queue.empty():
+                            break
+                        message = await queue.get()
+
+                if (
+                    not sent_full_message
+                    or len(changed_step_ids) > 1
+                    or scrape_info.status != ScrapeStatus.running
+                ):
+                    # the client has no state to apply a delta to yet, the
+                    # batch touched several steps, or the run just ended —
+                    # the terminal wake message carries no step_id but the
+                    # cleanup also flipped the last step's status
+                    data = _dump_sse(scrape_info)
+                    sent_full_message = True
+                else:
+                    # only send the metadata and the step that changed, the
+                    # client merges the delta into its copy of the run
+                    data = _dump_sse(
+                        RunMessageDelta(
+                            metadata=scrape_info.metadata,
+                            changed_step=(
+                                scrape_info.get_step(changed_step_ids[0])
+                                if changed_step_ids
+                                else None
+                            ),
+                        )
+                    )
+                # skip the yield if nothing has changed since the last event
+                if data != last_data:
+                    last_data = data
+                    yield {"data": data}
+                if scrape_info.status != ScrapeStatus.running:
+                    return
             else:
-                await asyncio.sleep(15)
+                # wait for the scraper task to create the queue instead of
+                # polling, the timeout guards against scrapes that never start
+                try:
+                    await asyncio.wait_for(
+                        queue_ready.setdefault(
+                            item_key, asyncio.Event()
+                        ).wait(),
+                        timeout=15,
+                    )
+                except asyncio.TimeoutError:
+                    pass
 
     return EventSourceResponse(event_generator())
 
@@ -245,32 +384,34 @@ async def run_status_ui(
 class ChatRequest(BaseModel):
     chat: list[ModelChat]
 
-    @validator("chat", pre=True)
+    @field_validator("chat", mode="before")
+    @classmethod
     def validate_chat(cls, v):
-        reconstructed_chat = [ModelChat.from_serialized(item) for item in v]
-        return reconstructed_chat
+        return [ModelChat.from_serialized(item) for item in v]
 
 
 @router.post("/chat", include_in_schema=False)
 async def chat_endpoint(request: ChatRequest):
     async def openai_chat_stream(
         request: OpenAiChatInput,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         async for output in openai_stream_response_generator(
             model_client, request, settings.openai_api_key
         ):
             if "error" in output:
-                yield output["error"]
+                yield output["error"].encode()
                 break
             else:
-                chat = ModelChat(
-                    role=ModelChatType.assistant, content=output["content"]
-                )
-                yield json.dumps(
+                # build the payload directly, a pydantic model plus stdlib
+                # json per token is a steady cpu tax on every chat
+                yield orjson.dumps(
                     {
-                        "content": chat.model_dump(),
+                        "content": {
+                            "role": ModelChatType.assistant.value,
+                            "content": output["content"],
+                        }
                     }
-                ) + "\n"
+                ) + b"\n"
 
     chat_input = OpenAiChatInput(
         messages=request.chat,
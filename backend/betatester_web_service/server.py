@@ -6,6 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from betatester.browser_pool import shutdown_browser_pool
+
 from betatester_web_service.db.base import create_tables, shutdown_session
 from betatester_web_service.routes import config, data, scraper
 from betatester_web_service.utils import (
@@ -23,6 +25,7 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     await create_tables()
     yield
+    await shutdown_browser_pool()
     await shutdown_session()
     await model_client.aclose()
 
@@ -45,6 +48,19 @@ app.add_middleware(
 )
 
 
+class UiStaticFiles(StaticFiles):
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if path.startswith("assets/"):
+            # vite content-hashes asset filenames, so browsers can cache
+            # them indefinitely; StaticFiles already answers matching
+            # If-None-Match requests with 304s
+            response.headers["Cache-Control"] = (
+                "public, max-age=31536000, immutable"
+            )
+        return response
+
+
 if settings.environment != Environment.dev:
 
     @app.get("/", include_in_schema=False)
@@ -56,5 +72,5 @@ if settings.environment != Environment.dev:
         return {"status": "ok"}
 
     app.mount(
-        "/", StaticFiles(directory="./betatester_web_service/ui/"), name="ui"
+        "/", UiStaticFiles(directory="./betatester_web_service/ui/"), name="ui"
     )
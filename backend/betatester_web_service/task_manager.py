@@ -18,7 +18,6 @@ class TaskManager:
             logger.info("Task cancelled")
         except Exception:
             logger.exception(f"Task {task_id} failed")
-        del self.tasks[task_id]
 
     def add_task(
         self, task_id: str, function: Callable, *args, **kwargs
@@ -27,6 +26,9 @@ class TaskManager:
             self._execute_task(task_id, function, *args, **kwargs)
         )
         self.tasks[task_id] = task
+        # removal lives in one place so the task body and the cancel
+        # paths never race over dict membership
+        task.add_done_callback(lambda _: self.tasks.pop(task_id, None))
 
     def cancel_task(self, task_id: str) -> None:
         task = self.tasks.get(task_id)
@@ -36,9 +38,9 @@ class TaskManager:
             logger.info(f"Task {task_id} not found or already done")
 
     def cancel_all_tasks(self):
-        for task in self.tasks.values():
+        # iterate a copy, each task's done callback pops its own entry
+        for task in list(self.tasks.values()):
             task.cancel()
-        self.tasks = {}
 
 
 task_manager = TaskManager()
@@ -1,11 +1,26 @@
+import json
 import logging.config
 from enum import Enum
 
 import httpx
 from betatester.betatester_types import FileClientType
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings
 
-model_client = httpx.AsyncClient()
+# keep-alive plus http/2 multiplexing avoids re-running the TLS handshake
+# for every model call; per-request timeouts are set at the call sites in
+# betatester.model, and connect-level retries smooth over transient resets
+model_client = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=60,
+        ),
+    ),
+)
 
 
 class Environment(str, Enum):
@@ -13,15 +28,29 @@ class Environment(str, Enum):
     prod = "prod"
 
 
+class FileClientConfig(BaseModel):
+    save_path: str
+
+
 class Settings(BaseSettings):
     openai_api_key: str
     postgres_uri: str
     file_client_type: FileClientType = FileClientType.local
-    file_client_config: str = '{"save_path": "/app-data/"}'
+    file_client_config: FileClientConfig = FileClientConfig(
+        save_path="/app-data/"
+    )
     base_url: str = "http://localhost:8080"
     environment: Environment = Environment.dev
     log_level: str = "INFO"
 
+    @field_validator("file_client_config", mode="before")
+    @classmethod
+    def _parse_file_client_config(cls, value):
+        # the env var is a json string, parse it once at startup
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
     @property
     def postgres_connection_string(self) -> str:
         return self.postgres_uri.replace(
@@ -32,18 +61,19 @@ class Settings(BaseSettings):
 settings = Settings()  # type: ignore
 
 
+# attributes present on every LogRecord, computed once so format() doesn't
+# build a throwaway record per log line
+_RESERVED_LOG_KEYS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None, None).__dict__
+) | {"message"}
+
+
 class CustomLogFormatter(logging.Formatter):
     def format(self, record):
         extra_vars = []
 
         for key, value in record.__dict__.items():
-            if (
-                key
-                not in logging.LogRecord(
-                    "", 0, "", 0, "", (), None, None
-                ).__dict__
-                and key != "message"
-            ):
+            if key not in _RESERVED_LOG_KEYS:
                 extra_vars.append(f"{key}={value}")
 
         if extra_vars:
@@ -53,8 +83,12 @@ class CustomLogFormatter(logging.Formatter):
 
 class EndpointFilter(logging.Filter):
     def filter(self, record):
-        # filter out healthz requests
-        return record.getMessage().find("/healthz") == -1
+        # filter out healthz requests, checking the path arg directly avoids
+        # formatting the full access log line just to discard it
+        try:
+            return "/healthz" not in record.args[2]  # type: ignore
+        except (IndexError, TypeError):
+            return record.getMessage().find("/healthz") == -1
 
 
 def setup_logging() -> None:
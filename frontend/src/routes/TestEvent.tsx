@@ -1,6 +1,6 @@
 import { Layout } from "../components/Layout";
 import { useEffect, useState } from "react";
-import { RunMessage } from "../types";
+import { RunMessage, RunMessageDelta, ScrapeStatus } from "../types";
 import { RunMessageView } from "../components/RunView";
 import { toast } from "sonner";
 import { useParams } from "react-router-dom";
@@ -21,10 +21,35 @@ export const TestEventRoute = () => {
         `/api/v1/scraper/status-ui/${configId}/${scrapeId}`
       );
       eventSource.onmessage = (event) => {
-        const data: RunMessage = JSON.parse(event.data);
-        setRunMessage(data);
-        if (data.status !== "running") {
-          switch (data.status) {
+        const data: RunMessage | RunMessageDelta = JSON.parse(event.data);
+        let status: ScrapeStatus;
+        if ("steps" in data) {
+          // full message, replace the state wholesale
+          setRunMessage(data);
+          status = data.status;
+        } else {
+          // delta, merge the metadata and changed step into the state
+          status = data.metadata.status;
+          setRunMessage((prev) => {
+            if (prev === null) {
+              return prev;
+            }
+            const steps = [...prev.steps];
+            if (data.changed_step !== null) {
+              const stepIndex = steps.findIndex(
+                (step) => step.step_id === data.changed_step!.step_id
+              );
+              if (stepIndex >= 0) {
+                steps[stepIndex] = data.changed_step;
+              } else {
+                steps.push(data.changed_step);
+              }
+            }
+            return { ...prev, ...data.metadata, steps };
+          });
+        }
+        if (status !== "running") {
+          switch (status) {
             case "completed":
               toast.success("Test completed");
               break;
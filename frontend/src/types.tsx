@@ -70,6 +70,11 @@ export interface RunMessage extends RunEventMetadata {
   steps: RunStep[];
 }
 
+export interface RunMessageDelta {
+  metadata: RunEventMetadata;
+  changed_step: RunStep | null;
+}
+
 export interface FileInfo {
   name: string;
   b64_content: string;
@@ -1,10 +1,21 @@
-import base64
+import asyncio
 from abc import abstractmethod
+from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 from typing import Literal, Optional, Union, cast
 from uuid import UUID
 
-from pydantic import BaseModel, field_serializer, model_serializer
+from pydantic import BaseModel, PrivateAttr, field_serializer, model_serializer
+
+try:
+    # pybase64 uses SIMD instructions to decode large payloads much faster
+    # than the stdlib, install with `pip install betatester[speedups]`
+    from pybase64 import b64decode
+except ImportError:
+    # a2b_base64 is the C primitive base64.b64decode wraps, minus the
+    # argument-conversion shim; it accepts ascii str directly
+    from binascii import a2b_base64 as b64decode
 
 
 class SpecialInstruction(str, Enum):
@@ -52,12 +63,10 @@ class ModelChatContent(BaseModel):
     @model_serializer
     def serialize(self) -> SerializedModelChatContent:
         content_key = self.type.value
-        content_value = (
-            self.content
-            if isinstance(self.content, str)
-            else self.content.model_dump()
-        )
-        return {"type": self.type.value, content_key: content_value}
+        content_value = self.content
+        if not isinstance(content_value, str):
+            content_value = content_value.model_dump()
+        return {"type": content_key, content_key: content_value}
 
     @classmethod
     def from_serialized(
@@ -146,16 +155,22 @@ class OpenAiChatInput(BaseModel):
     logprobs: bool = False
     top_logprobs: Optional[int] = None
 
-    @property
-    def data(self) -> dict:
+    @cached_property
+    def _data_exclusion(self) -> Optional[set[str]]:
+        # tools and tool_choice are fixed at construction, so the exclusion
+        # set only needs to be computed once per instance
         exclusion = set()
         if self.tools is None:
             exclusion.add("tools")
         if self.tool_choice is None:
             exclusion.add("tool_choice")
+        return exclusion or None
 
+    @property
+    def data(self) -> dict:
+        # the full dump cannot be cached because messages grow between calls
         return self.model_dump(
-            exclude=exclusion,
+            exclude=self._data_exclusion,
         )
 
 
@@ -163,11 +178,17 @@ class FileInfo(BaseModel):
     name: str
     b64_content: str
     mime_type: str
+    _buffer_cache: Optional[bytes] = PrivateAttr(default=None)
 
     @property
     def buffer(self) -> bytes:
-        # file strings are base64 url encoded
-        return base64.b64decode(self.b64_content.split(",", 1)[1])
+        if self._buffer_cache is None:
+            # file strings are base64 url encoded, slice past the data-uri
+            # prefix and cache the decoded bytes for repeated accesses
+            self._buffer_cache = b64decode(
+                self.b64_content[self.b64_content.find(",") + 1 :]
+            )
+        return self._buffer_cache
 
     @property
     def input_files(self) -> dict[str, Union[str, bytes]]:
@@ -177,6 +198,13 @@ class FileInfo(BaseModel):
             "mimeType": self.mime_type,
         }
 
+    async def input_files_async(self) -> dict[str, Union[str, bytes]]:
+        # the first buffer access decodes the whole file, run it off the
+        # event loop so a large upload doesn't stall other tasks
+        if self._buffer_cache is None:
+            await asyncio.to_thread(lambda: self.buffer)
+        return self.input_files
+
 
 ScrapeVariables = dict[str, str]
 ScrapeFiles = dict[str, FileInfo]
@@ -238,7 +266,13 @@ class ScrapeSpec(BaseModel):
         return str(original_scrape_id)
 
 
-class ExecutorMessage(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ExecutorMessage:
+    """
+    Internal progress message published by the executors, it never crosses a
+    trust boundary so it skips pydantic validation entirely
+    """
+
     step_id: Optional[UUID] = None
     scrape_page_view_count: Optional[int] = None
     scrape_action_count: Optional[int] = None
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Optional
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+logger = logging.getLogger(__name__)
+
+_playwright: Optional[Playwright] = None
+_browsers: dict[bool, Browser] = {}
+_lock = asyncio.Lock()
+
+
+async def get_browser(headless: bool = True) -> Browser:
+    """
+    Return a shared chromium instance, launching it on first use
+
+    Launching a browser costs seconds while creating a context is cheap,
+    so executors share one browser per headless mode and open a fresh
+    context per run
+    """
+    global _playwright
+    async with _lock:
+        browser = _browsers.get(headless)
+        if browser is not None and browser.is_connected():
+            return browser
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+        logger.info("Launching chromium (headless=%s)", headless)
+        browser = await _playwright.chromium.launch(headless=headless)
+        _browsers[headless] = browser
+        return browser
+
+
+async def shutdown_browser_pool() -> None:
+    """
+    Close any pooled browsers and stop playwright, call on process shutdown
+    """
+    global _playwright
+    async with _lock:
+        for browser in _browsers.values():
+            if browser.is_connected():
+                await browser.close()
+        _browsers.clear()
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
@@ -14,6 +14,7 @@ from .betatester_types import (
     ScrapeFiles,
     ScrapeVariables,
 )
+from .browser_pool import shutdown_browser_pool
 
 app = typer.Typer(no_args_is_help=True)
 
@@ -52,10 +53,21 @@ def _create_file_client(file_client: FileClientType) -> FileClient:
         raise ValueError(f"Invalid file provider: {file_client}")
 
 
+async def _run_scraper_async(
+    scraper: Union[ScrapeAiExecutor, ScrapeSpecExecutor],
+):
+    try:
+        return await scraper.run()
+    finally:
+        # the cli owns the process, close the pooled browser before the
+        # event loop goes away
+        await shutdown_browser_pool()
+
+
 def _run_scraper(scraper: Union[ScrapeAiExecutor, ScrapeSpecExecutor]):
     output = None
     try:
-        output = asyncio.run(scraper.run())
+        output = asyncio.run(_run_scraper_async(scraper))
         print()
         print("Test [bold green]completed[/bold green] successfully!")
     except Exception as e:
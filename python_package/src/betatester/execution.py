@@ -4,17 +4,22 @@ import json
 import logging
 import re
 import tempfile
+import threading
 from abc import abstractmethod
-from typing import Any, Generic, Optional, TypeVar, Union, cast
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Coroutine, Generic, Optional, TypeVar
 from uuid import UUID, uuid4
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+import lxml.html
+from lxml import etree
 from playwright.async_api import (
+    BrowserContext,
     Page,
     TimeoutError,
     ViewportSize,
-    async_playwright,
 )
 
 from .betatester_types import (
@@ -33,6 +38,7 @@ from .betatester_types import (
     ScrapeVariables,
     SpecialInstruction,
 )
+from .browser_pool import get_browser
 from .model import openai_stream_response_generator, send_openai_request
 from .prompts import (
     create_choose_action_system_prompt,
@@ -43,7 +49,7 @@ from .prompts import (
 
 logger = logging.getLogger("betatester")
 
-ALLOWED_TAG_SET = set(["id", "for", "type", "allow", "aria-label"])
+ALLOWED_TAG_SET = frozenset({"id", "for", "type", "allow", "aria-label"})
 
 
 class ActionNotFoundException(Exception):
@@ -62,28 +68,75 @@ class MaxTotalActionsReachedException(Exception):
     pass
 
 
+# strips everything except alphanumeric and whitespace characters (\w also
+# matches underscores, so they are excluded explicitly)
+_NAME_SANITIZE_RE = re.compile(r"[^\w\s]|_")
+
+
+_default_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_default_http_client() -> httpx.AsyncClient:
+    # shared keep-alive pool for executors that weren't handed a client,
+    # so successive model calls reuse connections instead of paying a TLS
+    # handshake each
+    global _default_http_client
+    if _default_http_client is None or _default_http_client.is_closed:
+        _default_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=32, max_keepalive_connections=16
+            )
+        )
+    return _default_http_client
+
+
+@lru_cache(maxsize=512)
+def _sanitize_name(name: str) -> str:
+    return _NAME_SANITIZE_RE.sub("", name).strip()
+
+
+def _log_artifact_save(artifact: str):
+    def _callback(task: "asyncio.Task[str]") -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("Failed to save %s: %s", artifact, exc)
+        else:
+            logger.info("Saved %s to %s", artifact, task.result())
+
+    return _callback
+
+
+# the event loop only keeps weak references to tasks, so background
+# artifact writes park a strong reference here until they finish
+_pending_saves: set["asyncio.Task[str]"] = set()
+
+
+def _dispatch_artifact_save(
+    coro: Coroutine[Any, Any, str], artifact: str
+) -> None:
+    task = asyncio.create_task(coro)
+    _pending_saves.add(task)
+    task.add_done_callback(_log_artifact_save(artifact))
+    task.add_done_callback(_pending_saves.discard)
+
+
 async def _execute_action(
     page: Page,
     action: Action,
     variables: ScrapeVariables,
     files: ScrapeFiles,
 ):
-    # strip non space and alphanumeric characters from the element name
     if action.element.selector is not None:
         element = page.locator(f"{action.element.selector}")
     elif action.element.role is not None:
-        kwargs: dict[str, Union[str, re.Pattern]] = {
-            "role": action.element.role
-        }
+        kwargs: dict[str, str] = {"role": action.element.role}
         if action.element.name is not None:
-            kwargs["name"] = re.compile(
-                "".join(
-                    char
-                    for char in action.element.name
-                    if char.isalnum() or char.isspace()
-                ).strip(),
-                re.IGNORECASE,
-            )
+            # playwright matches plain-string names case-insensitively as a
+            # substring, so the sanitized name doesn't need a regex wrapper
+            # marshalled over the driver protocol
+            kwargs["name"] = _sanitize_name(action.element.name)
         element = page.get_by_role(**kwargs)  # type: ignore
     else:
         raise ActionNotFoundException("Action requires either an id or a role")
@@ -113,7 +166,9 @@ async def _execute_action(
                 f"Action value {action.action_value} not found in files"
             )
 
-        await element.set_input_files(file.input_files)  # type: ignore
+        await element.set_input_files(
+            await file.input_files_async()  # type: ignore
+        )
     elif action.action_type == ActionType.none:
         pass
     else:
@@ -122,23 +177,41 @@ async def _execute_action(
         )
 
 
-# Function to strip attributes except for 'id'
-def _strip_attributes_except_allowed_set(element: Tag):
-    for tag in element.find_all(True) + [element]:
-        attrs = dict(
-            tag.attrs
-        )  # Make a copy to avoid changing size during iteration
-        for attr in attrs:
-            if attr not in ALLOWED_TAG_SET:
-                del tag.attrs[attr]
-
-
-def _strip_all_script_and_style_tags(element: Tag):
-    for tag in element.find_all("script"):
-        tag.decompose()
-
-    for tag in element.find_all("style"):
-        tag.decompose()
+# consecutive steps often see an identical DOM (e.g. an action that only
+# opened a menu playwright re-renders), so the cleaned output is memoized
+# by content hash; keys are digests rather than the multi-MB pages. the
+# lock keeps the cache consistent when concurrent runs clean pages on
+# worker threads
+_CLEAN_HTML_CACHE: OrderedDict[bytes, str] = OrderedDict()
+_CLEAN_HTML_CACHE_SIZE = 32
+_clean_html_cache_lock = threading.Lock()
+
+
+def _clean_body_html(html_content: str) -> str:
+    key = blake2b(html_content.encode(), digest_size=16).digest()
+    with _clean_html_cache_lock:
+        cached = _CLEAN_HTML_CACHE.get(key)
+        if cached is not None:
+            _CLEAN_HTML_CACHE.move_to_end(key)
+            return cached
+    # lxml parses and strips scripts/styles in C; the attribute filter is
+    # the only python-level walk left
+    root = lxml.html.document_fromstring(html_content)
+    body = root.body
+    etree.strip_elements(body, "script", "style", with_tail=False)
+    for element in body.iter():
+        if not isinstance(element.tag, str):
+            # comments and processing instructions carry no attributes
+            continue
+        attrib = element.attrib
+        for attr in [a for a in attrib if a not in ALLOWED_TAG_SET]:
+            del attrib[attr]
+    clean_html = lxml.html.tostring(body, encoding="unicode")
+    with _clean_html_cache_lock:
+        _CLEAN_HTML_CACHE[key] = clean_html
+        if len(_CLEAN_HTML_CACHE) > _CLEAN_HTML_CACHE_SIZE:
+            _CLEAN_HTML_CACHE.popitem(last=False)
+    return clean_html
 
 
 class _AiExecutorBase:
@@ -169,6 +242,7 @@ class _ScrapeExecutorBase(Generic[T]):
         scrape_id: Optional[UUID] = None,
         save_playwright_trace: bool = False,
         headless: bool = True,
+        context: Optional[BrowserContext] = None,
     ) -> None:
         if file_client is None and save_playwright_trace:
             raise ValueError(
@@ -184,6 +258,7 @@ class _ScrapeExecutorBase(Generic[T]):
 
         self.headless = headless
         self.save_playwright_trace = save_playwright_trace
+        self.context = context
 
     @abstractmethod
     async def _execute(self, page: Page) -> None:
@@ -202,39 +277,46 @@ class _ScrapeExecutorBase(Generic[T]):
 
         logger.info("Starting to test %s", self.url)
         logger.info("===============================================")
-        async with async_playwright() as p:
-            # initial setup and navigation
-            browser = await p.chromium.launch(headless=self.headless)
+        # the browser is shared across runs, only the context is per-run
+        # unless the caller passed one in to keep e.g. a login session
+        # alive across runs
+        context = self.context
+        owns_context = context is None
+        if context is None:
+            browser = await get_browser(self.headless)
             context = await browser.new_context(
                 viewport=self.viewport,
             )
-            if self.save_playwright_trace:
-                logger.info("Starting playwright tracing...")
-                await context.tracing.start(screenshots=True, snapshots=True)
-            page = await context.new_page()
+        if self.save_playwright_trace:
+            logger.info("Starting playwright tracing...")
+            await context.tracing.start(screenshots=True, snapshots=True)
+        page = await context.new_page()
 
-            await self._run_start_callback()
+        await self._run_start_callback()
 
-            try:
-                await self._execute(page)
-            finally:
-                # cleanup trace
-                if self.save_playwright_trace:
-                    trace_tempdir = tempfile.TemporaryDirectory()
-                    output_path = f"{trace_tempdir.name}/{self.scrape_id}.zip"
-                    await context.tracing.stop(path=output_path)
-                    if self.file_client is not None:
-                        save_path = await self.file_client.save_trace(
-                            self.scrape_id, output_path
-                        )
-                        logger.info("Saved trace to %s", save_path)
-                    trace_tempdir.cleanup()
+        try:
+            await self._execute(page)
+        finally:
+            # cleanup trace
+            if self.save_playwright_trace:
+                trace_tempdir = tempfile.TemporaryDirectory()
+                output_path = f"{trace_tempdir.name}/{self.scrape_id}.zip"
+                await context.tracing.stop(path=output_path)
+                if self.file_client is not None:
+                    save_path = await self.file_client.save_trace(
+                        self.scrape_id, output_path
+                    )
+                    logger.info("Saved trace to %s", save_path)
+                trace_tempdir.cleanup()
 
-                # cleanup playwright
+            # cleanup the per-run context, the pooled browser stays up; a
+            # caller-owned context only loses the page opened here
+            if owns_context:
                 await context.close()
-                await browser.close()
+            else:
+                await page.close()
 
-                return_value = await self._run_end_callback()
+            return_value = await self._run_end_callback()
 
         logger.info("Test %s completed", self.url)
         logger.info(
@@ -318,33 +400,36 @@ class ScrapeStepAiExecutor(_AiExecutorBase):
     async def _take_screenshot(self) -> str:
         screenshot_bytes = await self.page.screenshot(full_page=True)
         if self.file_client is not None:
-            path = await self.file_client.save_img(
-                self.scrape_id, self.step_id, screenshot_bytes
+            # write the image in the background, the model call doesn't
+            # need to wait on the disk
+            _dispatch_artifact_save(
+                self.file_client.save_img(
+                    self.scrape_id, self.step_id, screenshot_bytes
+                ),
+                "screenshot",
             )
-            logger.info("Saved screenshot to %s", path)
-        # base64 encode the screenshot
-        screenshot_b64 = base64.b64encode(screenshot_bytes).decode()
-        return screenshot_b64
+        # full-page screenshots run to several MB, encode off the event
+        # loop so the save task and other runs keep moving
+        encoded = await asyncio.to_thread(base64.b64encode, screenshot_bytes)
+        return encoded.decode("ascii")
 
     async def _get_html(self) -> str:
         html_content = await self.page.content()
-        soup = BeautifulSoup(html_content, "lxml")
-        # get body tag
-        clean_html = cast(Tag, soup.find("body"))
-        _strip_all_script_and_style_tags(clean_html)
-        _strip_attributes_except_allowed_set(clean_html)
-        clean_html = str(clean_html)
+        # parsing a multi-MB page is pure CPU, keep it off the event loop
+        clean_html = await asyncio.to_thread(_clean_body_html, html_content)
         if self.file_client is not None:
-            full_path, clean_path = await asyncio.gather(
-                self.file_client.save_html(
-                    self.scrape_id, self.step_id, html_content, HtmlType.full
-                ),
-                self.file_client.save_html(
-                    self.scrape_id, self.step_id, clean_html, HtmlType.clean
-                ),
-            )
-            logger.info("Saved full html to %s", full_path)
-            logger.info("Saved clean html to %s", clean_path)
+            # write both variants in the background, the choose-action call
+            # doesn't need to wait on the disk
+            for html, html_type in (
+                (html_content, HtmlType.full),
+                (clean_html, HtmlType.clean),
+            ):
+                _dispatch_artifact_save(
+                    self.file_client.save_html(
+                        self.scrape_id, self.step_id, html, html_type
+                    ),
+                    f"{html_type.value} html",
+                )
 
         html_mrkdown = f"```html\n{clean_html}\n```"
 
@@ -368,9 +453,10 @@ class ScrapeStepAiExecutor(_AiExecutorBase):
         )
 
         next_instruction = ""
-        async for output in openai_stream_response_generator(
+        stream = openai_stream_response_generator(
             http_client, openai_chat_input, self._openai_api_key
-        ):
+        )
+        async for output in stream:
             if "error" in output:
                 raise NextStepNotFoundException(output["error"])
             else:
@@ -381,6 +467,14 @@ class ScrapeStepAiExecutor(_AiExecutorBase):
                         next_step=next_instruction,
                     )
                 )
+                if (
+                    "DONE" in next_instruction
+                    or "WAIT" in next_instruction
+                ):
+                    # terminal signal, close the stream instead of paying
+                    # for the rest of the generation
+                    await stream.aclose()
+                    break
         logger.info("\x1b[1;34mNext instruction\x1b[0m: %s", next_instruction)
         self.next_step_chat.append(
             ModelChat(
@@ -418,10 +512,12 @@ class ScrapeStepAiExecutor(_AiExecutorBase):
             "function"
         ]["arguments"]
 
+        # action_raw is already a json string, echo it into the chat as-is
+        # instead of re-encoding it with json.dumps
         self.choose_action_chat.append(
             ModelChat(
                 role=ModelChatType.assistant,
-                content=json.dumps(action_raw, indent=2),
+                content=action_raw,
             )
         )
 
@@ -504,29 +600,30 @@ class ScrapeStepAiExecutor(_AiExecutorBase):
         return action, self.actions_count
 
     async def run(self) -> tuple[Optional[str], Optional[Action], int]:
-        if self.http_client is None:
-            http_client = httpx.AsyncClient()
-        else:
-            http_client = self.http_client
+        http_client = self.http_client or _get_default_http_client()
 
-        next_instruction = None
-        action = None
+        # capture the html as a real task so it overlaps the screenshot
+        # and the model stream; a bare coroutine would not start running
+        # until awaited
+        html_task = asyncio.create_task(self._get_html())
         try:
             encoded_image = await self._take_screenshot()
-            html_coro = self._get_html()
             next_instruction = await self._get_next_step(
                 encoded_image, http_client
             )
-            html = await html_coro
-            if "DONE" in next_instruction or "WAIT" in next_instruction:
-                return next_instruction, None, 0
-
-            action, action_count = await self._choose_and_execute_action(
-                next_instruction, html, http_client
-            )
-        finally:
-            if self.http_client is None:
-                await http_client.aclose()
+        except BaseException:
+            html_task.cancel()
+            raise
+        if "DONE" in next_instruction or "WAIT" in next_instruction:
+            # the html is only used to choose an action, so stop the
+            # speculative capture instead of waiting for it to finish
+            html_task.cancel()
+            return next_instruction, None, 0
+        html = await html_task
+
+        action, action_count = await self._choose_and_execute_action(
+            next_instruction, html, http_client
+        )
         return next_instruction, action, action_count
 
 
@@ -549,6 +646,7 @@ class ScrapeAiExecutor(_AiExecutorBase, _ScrapeExecutorBase[ScrapeSpec]):
         http_client: Optional[httpx.AsyncClient] = None,
         subscriptions: Optional[set[asyncio.Queue[ExecutorMessage]]] = None,
         headless: bool = True,
+        context: Optional[BrowserContext] = None,
     ) -> None:
         """
         Runs a test on a given URL with a high level goal until the goal is completed or it errors out
@@ -580,6 +678,7 @@ class ScrapeAiExecutor(_AiExecutorBase, _ScrapeExecutorBase[ScrapeSpec]):
             http_client (Optional[httpx.AsyncClient], optional): Http client to use for making requests, pass one through to reuse across tests. Defaults to None.
             subscriptions (Optional[set[asyncio.Queue[ExecutorMessage]], optional): Subscriptions that will receive messages from the executor as it progresses. Defaults to None.
             headless (bool, optional): Whether to run the browser in headless mode, if False a chromium browswer will display the actions of the test in real time. Defaults to True.
+            context (Optional[BrowserContext], optional): Browser context to run the test in, pass one through to reuse e.g. a login session across tests. The caller owns the context and the executor only opens and closes a page in it. Defaults to None.
         """
         _ScrapeExecutorBase.__init__(
             self,
@@ -591,6 +690,7 @@ class ScrapeAiExecutor(_AiExecutorBase, _ScrapeExecutorBase[ScrapeSpec]):
             scrape_id=scrape_id,
             save_playwright_trace=save_playwright_trace,
             headless=headless,
+            context=context,
         )
         _AiExecutorBase.__init__(self, subscriptions=subscriptions)
         self._openai_api_key = openai_api_key
@@ -604,7 +704,6 @@ class ScrapeAiExecutor(_AiExecutorBase, _ScrapeExecutorBase[ScrapeSpec]):
         self.scrape_action_count = 0
 
         self.http_client = http_client
-        self.close_http_client = http_client is None
 
         self.previous_steps: list[str] = []
 
@@ -612,7 +711,7 @@ class ScrapeAiExecutor(_AiExecutorBase, _ScrapeExecutorBase[ScrapeSpec]):
 
     async def _run_start_callback(self) -> None:
         if self.http_client is None:
-            self.http_client = httpx.AsyncClient()
+            self.http_client = _get_default_http_client()
 
     async def _run_end_callback(self) -> ScrapeSpec:
         spec = ScrapeSpec(
@@ -734,6 +833,7 @@ class ScrapeSpecExecutor(_ScrapeExecutorBase[None]):
         file_client: Optional[FileClient] = None,
         save_playwright_trace: bool = False,
         headless: bool = True,
+        context: Optional[BrowserContext] = None,
     ) -> None:
         """
         Executes a test on a given URL from a previously saved scrape spec
@@ -754,6 +854,7 @@ class ScrapeSpecExecutor(_ScrapeExecutorBase[None]):
             file_client (Optional[FileClient], optional): File client to use for saving images, html, and traces. Defaults to None.
             save_playwright_trace (bool, optional): Whether to save the playwright trace, see https://playwright.dev/python/docs/trace-viewer-int for more information. You must provide a file_client to use this option. Defaults to False.
             headless (bool, optional): Whether to run the browser in headless mode, if False a chromium browswer will display the actions of the test in real time. Defaults to True.
+            context (Optional[BrowserContext], optional): Browser context to run the test in, pass one through to reuse e.g. a login session across tests. The caller owns the context and the executor only opens and closes a page in it. Defaults to None.
         """
         _ScrapeExecutorBase.__init__(
             self,
@@ -765,6 +866,7 @@ class ScrapeSpecExecutor(_ScrapeExecutorBase[None]):
             scrape_id=scrape_id,
             save_playwright_trace=save_playwright_trace,
             headless=headless,
+            context=context,
         )
         self.original_scrape_id = scrape_spec.original_scrape_id
         self.scrape_events = scrape_spec.scrape_events
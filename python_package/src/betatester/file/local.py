@@ -1,4 +1,6 @@
+import asyncio
 import os
+import shutil
 from uuid import UUID
 
 import aiofiles
@@ -9,6 +11,15 @@ from ..betatester_types import FileClient, HtmlType
 class LocalFileClient(FileClient):
     def __init__(self, save_path: str):
         self.save_path = save_path
+        # makedirs walks the whole path with a stat per component, so
+        # remember which directories already exist and skip the syscalls
+        # on repeat saves
+        self._ensured_dirs: set[str] = set()
+
+    def _ensure_dir(self, dirname: str) -> None:
+        if dirname not in self._ensured_dirs:
+            os.makedirs(dirname, exist_ok=True)
+            self._ensured_dirs.add(dirname)
 
     def _create_imgs_path(
         self,
@@ -22,7 +33,7 @@ class LocalFileClient(FileClient):
             f"{step_id}.png",
         )
 
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(path))
         return path
 
     def _create_html_path(
@@ -39,7 +50,7 @@ class LocalFileClient(FileClient):
             f"{html_type.value}.html",
         )
 
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(path))
         return path
 
     def _create_traces_path(
@@ -48,23 +59,18 @@ class LocalFileClient(FileClient):
     ) -> str:
         path = os.path.join(self.save_path, "traces", f"{scrape_id}.zip")
 
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        return path
-
-    def _create_representation_path(
-        self,
-        scrape_id: UUID,
-    ) -> str:
-        path = os.path.join(self.save_path, "scrapes", f"{scrape_id}.json")
-
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(path))
         return path
 
     async def save_trace(self, scrape_id: UUID, tmp_trace_path: str) -> str:
         path = self._create_traces_path(scrape_id)
-        async with aiofiles.open(tmp_trace_path, "rb") as f:
-            async with aiofiles.open(path, "wb") as f_out:
-                await f_out.write(await f.read())
+        try:
+            # a same-filesystem rename moves the trace without copying its
+            # bytes, the temp file is discarded afterwards anyway
+            await asyncio.to_thread(os.replace, tmp_trace_path, path)
+        except OSError:
+            # temp dir on a different filesystem
+            await asyncio.to_thread(shutil.copyfile, tmp_trace_path, path)
 
         return path
 
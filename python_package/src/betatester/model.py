@@ -39,7 +39,7 @@ async def _stream_openai_chat_api(
     client: httpx.AsyncClient,
     openai_input: OpenAiChatInput,
     api_key: str,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     async with client.stream(
         "POST",
         "https://api.openai.com/v1/chat/completions",
@@ -56,7 +56,7 @@ async def _stream_openai_chat_api(
                 f"Error in OpenAI chat API: {response.status_code} {response_body.decode()}"
             )
         response.raise_for_status()
-        async for chunk in response.aiter_text():
+        async for chunk in response.aiter_bytes():
             yield chunk
 
 
@@ -68,41 +68,49 @@ async def openai_stream_response_generator(
     content = ""
     func_call = {"arguments": ""}
     error_message = None
+    buffer = bytearray()
     try:
-        async for response in _stream_openai_chat_api(
+        async for chunk in _stream_openai_chat_api(
             client, openai_chat_input, api_key
         ):
-            for block_raw in response.split("\n\n"):
-                for line in block_raw.split("\n"):
-                    if line.startswith("data:"):
-                        json_str = line.replace("data:", "").strip()
-                        if json_str == "[DONE]":
-                            break
-                        else:
-                            try:
-                                block = json.loads(json_str)
-                            # skip any json decode errors
-                            except Exception as e:
-                                logger.debug(e)
-                                continue
+            # network chunks can split an sse event anywhere, so events are
+            # carved out of a persistent buffer instead of parsing each
+            # chunk on its own
+            buffer += chunk
+            while True:
+                event_end = buffer.find(b"\n\n")
+                if event_end == -1:
+                    break
+                event = bytes(buffer[:event_end])
+                del buffer[: event_end + 2]
+                for line in event.split(b"\n"):
+                    if not line.startswith(b"data:"):
+                        continue
+                    json_str = line[5:].strip()
+                    if json_str == b"[DONE]":
+                        continue
+                    try:
+                        block = json.loads(json_str)
+                    # skip any json decode errors
+                    except Exception as e:
+                        logger.debug(e)
+                        continue
 
-                            # we assume that we only need to look at the first choice
-                            choice = block["choices"][0]
-                            delta = choice.get("delta")
-                            if delta is None:
-                                continue
-                            elif "function_call" in delta:
-                                name = delta["function_call"].get("name")
-                                if name:
-                                    func_call["name"] = name
-                                arguments = delta["function_call"].get(
-                                    "arguments"
-                                )
-                                if arguments:
-                                    func_call["arguments"] += arguments
-                            elif "content" in delta:
-                                content += delta["content"]
-                                yield {"content": content}
+                    # we assume that we only need to look at the first choice
+                    choice = block["choices"][0]
+                    delta = choice.get("delta")
+                    if delta is None:
+                        continue
+                    elif "function_call" in delta:
+                        name = delta["function_call"].get("name")
+                        if name:
+                            func_call["name"] = name
+                        arguments = delta["function_call"].get("arguments")
+                        if arguments:
+                            func_call["arguments"] += arguments
+                    elif "content" in delta:
+                        content += delta["content"]
+                        yield {"content": content}
         if func_call.get("name"):
             yield {"func_call": func_call}
 
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from .betatester_types import (
     ActionType,
     ModelChat,
@@ -12,17 +14,10 @@ from .betatester_types import (
 )
 
 
-def create_next_step_system_prompt(
-    high_level_goal: str,
-    previous_steps: list[str],
-) -> ModelChat:
-    previous_steps_str = (
-        "\n".join([f"{i}. {step}" for i, step in enumerate(previous_steps)])
-        if previous_steps
-        else "None"
-    )
-
-    system_prompt = f"""
+# the static instructions render once at import; keeping them as an
+# unchanging prefix ahead of the per-scrape tail also lets provider-side
+# prompt caching hit on it across runs
+_NEXT_STEP_STATIC_PREFIX = f"""
 ### FACTS
 - You are an expert website tester
 - You are given a HIGH_LEVEL_GOAL to accomplish on a website and a screenshot of the website
@@ -35,7 +30,20 @@ def create_next_step_system_prompt(
 - If the page has not been loaded, return {SpecialInstruction.WAIT.value}
 - If the HIGH_LEVEL_GOAL has been accomplished, return {SpecialInstruction.DONE.value}
     - Only return DONE if the screen you are looking at indicates the goal is complete
+"""
+
 
+def create_next_step_system_prompt(
+    high_level_goal: str,
+    previous_steps: list[str],
+) -> ModelChat:
+    previous_steps_str = (
+        "\n".join(f"{i}. {step}" for i, step in enumerate(previous_steps))
+        if previous_steps
+        else "None"
+    )
+
+    system_prompt = f"""{_NEXT_STEP_STATIC_PREFIX}
 HIGH_LEVEL_GOAL: {high_level_goal}
 
 PREVIOUS_STEPS:
@@ -66,15 +74,29 @@ HTML:
 def create_choose_action_system_prompt(
     variables: ScrapeVariables,
     files: ScrapeFiles,
+) -> ModelChat:
+    # variables and files are invariant within a scrape, so the prompt is
+    # cached on their keys to skip rebuilding it for every step
+    return _cached_choose_action_system_prompt(
+        tuple(sorted(variables)), tuple(sorted(files))
+    )
+
+
+@lru_cache(maxsize=256)
+def _cached_choose_action_system_prompt(
+    variable_keys_raw: tuple[str, ...],
+    file_keys_raw: tuple[str, ...],
 ) -> ModelChat:
     variable_keys = (
-        "\n".join([f"- {key}" for key in variables.keys()])
-        if variables
+        "\n".join([f"- {key}" for key in variable_keys_raw])
+        if variable_keys_raw
         else "None"
     )
 
     file_keys = (
-        "\n".join([f"- {key}" for key in files.keys()]) if files else "None"
+        "\n".join([f"- {key}" for key in file_keys_raw])
+        if file_keys_raw
+        else "None"
     )
 
     system_prompt = f"""
@@ -101,7 +123,7 @@ FILES:
     )
 
 
-def create_choose_action_tools() -> tuple[list[Tool], ToolChoiceObject]:
+def _build_choose_action_tools() -> tuple[list[Tool], ToolChoiceObject]:
     action_types = [
         action_type.value for action_type in ActionType.__members__.values()
     ]
@@ -145,5 +167,14 @@ def create_choose_action_tools() -> tuple[list[Tool], ToolChoiceObject]:
     )
 
     return [Tool(function=tool)], ToolChoiceObject(
-        function=ToolChoiceFunction(name="choose_action")
+        function=ToolChoiceFunction(name=tool_name)
     )
+
+
+# the tool schema is a constant, build it once at import time instead of
+# re-allocating the nested dicts and models on every step
+_CHOOSE_ACTION_TOOLS, _CHOOSE_ACTION_TOOL_CHOICE = _build_choose_action_tools()
+
+
+def create_choose_action_tools() -> tuple[list[Tool], ToolChoiceObject]:
+    return _CHOOSE_ACTION_TOOLS, _CHOOSE_ACTION_TOOL_CHOICE